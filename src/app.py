@@ -9,35 +9,126 @@ This application demonstrates various DevOps practices including:
 - API documentation
 """
 
+import atexit
+import hashlib
 import logging
 import os
+import signal
+import sys
+import threading
 import time
 from datetime import datetime
-from typing import Any, Dict
+from typing import Any, BinaryIO, Callable, Dict, Tuple
 
+import orjson
 import structlog
-from flask import Flask, jsonify, request
+from flask import Flask, Response, render_template, request
 from flask_caching import Cache
 from flask_restx import Api, Resource, fields
 from prometheus_client import (CONTENT_TYPE_LATEST, Counter, Histogram,
                                generate_latest)
 
+
+def _open_log_buffer() -> BinaryIO:
+    """Open a buffered binary writer on the process's stdout
+
+    The lines a request logs are coalesced and written with one flush at
+    the end of after_request instead of one write() per line. Warnings
+    and errors still flush immediately.
+    """
+    stdout = sys.__stdout__
+    if stdout is None:
+        # No console attached (e.g. pythonw); discard log output
+        return open(os.devnull, "wb")
+    return open(stdout.fileno(), "wb", buffering=4096, closefd=False)
+
+
+_log_buffer = _open_log_buffer()
+
+
+class _BufferedBytesLogger(structlog.BytesLogger):
+    """BytesLogger that only flushes for warnings and errors"""
+
+    __slots__ = ()
+
+    def buffered_msg(self, message: bytes) -> None:
+        """Write *message* without flushing"""
+        with self._lock:
+            self._write(message + b"\n")
+
+    log = debug = info = buffered_msg
+    warn = warning = structlog.BytesLogger.msg
+    fatal = failure = err = error = critical = exception = (
+        structlog.BytesLogger.msg)
+
+
+class _BufferedBytesLoggerFactory(structlog.BytesLoggerFactory):
+    """Produce loggers writing to the shared log buffer"""
+
+    __slots__ = ()
+
+    def __call__(self, *args: Any) -> _BufferedBytesLogger:
+        return _BufferedBytesLogger(self._file)
+
+
+def _flush_logs_on_sigterm(signum, frame):
+    """Flush buffered log lines, then defer to the previous SIGTERM handler"""
+    _log_buffer.flush()
+    if callable(_previous_sigterm_handler):
+        _previous_sigterm_handler(signum, frame)
+    elif _previous_sigterm_handler != signal.SIG_IGN:
+        signal.signal(signum, signal.SIG_DFL)
+        os.kill(os.getpid(), signum)
+
+
+atexit.register(_log_buffer.flush)
+_previous_sigterm_handler = signal.getsignal(signal.SIGTERM)
+try:
+    signal.signal(signal.SIGTERM, _flush_logs_on_sigterm)
+except ValueError:
+    # Signal handlers can only be installed from the main thread
+    pass
+
+
+# Configuration
+# Load configuration from config module; src/config.py is the single
+# source of settings whether we run as a package or as a script
+try:
+    from src.config import get_config
+except ImportError:
+    # Running from inside src/ (e.g. python src/app.py)
+    from config import get_config  # type: ignore[import-not-found,no-redef]
+config_class = get_config()
+
+
+def _log_level() -> int:
+    """Logging threshold from the config's LOG_LEVEL, defaulting to INFO"""
+    level = logging.getLevelName(str(config_class.LOG_LEVEL).upper())
+    return level if isinstance(level, int) else logging.INFO
+
+
+def _add_logger_name(logger, method_name, event_dict):
+    """Keep the "logger" field stdlib's add_logger_name used to emit"""
+    event_dict["logger"] = __name__
+    return event_dict
+
+
 # Configure structured logging
+# orjson renders each event straight to bytes, so the chain writes to
+# the log buffer without a str round-trip.
 structlog.configure(
     processors=[
-        structlog.stdlib.filter_by_level,
-        structlog.stdlib.add_logger_name,
-        structlog.stdlib.add_log_level,
-        structlog.stdlib.PositionalArgumentsFormatter(),
+        _add_logger_name,
+        structlog.processors.add_log_level,
         structlog.processors.TimeStamper(fmt="iso"),
         structlog.processors.StackInfoRenderer(),
         structlog.processors.format_exc_info,
         structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer(),
+        structlog.processors.JSONRenderer(serializer=orjson.dumps),
     ],
     context_class=dict,
-    logger_factory=structlog.stdlib.LoggerFactory(),
-    wrapper_class=structlog.stdlib.BoundLogger,
+    logger_factory=_BufferedBytesLoggerFactory(_log_buffer),
+    wrapper_class=structlog.make_filtering_bound_logger(_log_level()),
     cache_logger_on_first_use=True,
 )
 
@@ -45,23 +136,26 @@ logger = structlog.get_logger()
 
 # Create Flask application
 app = Flask(__name__)
-
-# Configuration
-# Load configuration from config module
-try:
-    from src.config import get_config
-    config_class = get_config()
-    app.config.from_object(config_class)
-except ImportError:
-    # Fallback configuration if import fails
-    app.config['SECRET_KEY'] = os.environ.get(
-        'SECRET_KEY') or 'dev-secret-key-change-in-production'
-    app.config['DEBUG'] = os.environ.get('FLASK_ENV') == 'development'
-    app.config['TESTING'] = False
+app.config.from_object(config_class)
 
 # Initialize cache
 cache = Cache(app)
 
+# index.html has no dynamic blocks, so render it once and serve the bytes
+with app.app_context():
+    _INDEX_HTML = render_template("index.html").encode()
+_INDEX_ETAG = hashlib.blake2b(_INDEX_HTML, digest_size=8).hexdigest()
+
+
+# Registered before the Api so it takes "/" ahead of flask-restx's root
+@app.route("/")
+def index():
+    """Main application page"""
+    response = Response(_INDEX_HTML, mimetype="text/html")
+    response.set_etag(_INDEX_ETAG)
+    return response.make_conditional(request)
+
+
 # Initialize API documentation
 api = Api(
     app,
@@ -77,7 +171,21 @@ REQUEST_COUNT = Counter(
         "method", "endpoint", "status"]
 )
 REQUEST_LATENCY = Histogram(
-    "http_request_duration_seconds", "HTTP request latency")
+    "http_request_duration_seconds", "HTTP request latency", ["endpoint"],
+    # Defaults stop at 10s; extend so slow requests keep their resolution
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+             1, 2.5, 5, 10, 30, 60),
+)
+
+# Endpoint label for requests that matched no route (404s), so scanners
+# probing random paths cannot grow the label set without bound
+UNMATCHED_ENDPOINT = "<unmatched>"
+
+# Metric children memoized on first use, so after_request skips the
+# labels() lookup afterwards. Keys are bounded by routes x methods x
+# statuses; nothing is pre-created, so /metrics only lists seen series.
+_COUNTER_CACHE: Dict[Tuple[str, str, int], Any] = {}
+_LATENCY_CACHE: Dict[str, Any] = {}
 
 # API models for documentation
 health_model = api.model(
@@ -101,13 +209,42 @@ metrics_model = api.model(
 
 # Global variables for monitoring
 start_time = time.time()
-request_times = []
+# Running request count and latency sum for /api/v1/metrics, kept
+# alongside REQUEST_LATENCY so reading them needs no collect()
+_request_count = 0
+_request_time_sum = 0.0
+_totals_lock = threading.Lock()
+
+# Paths hit by Prometheus scrapes and liveness probes; their requests are
+# still counted but not logged
+QUIET_PATHS = frozenset({"/metrics", "/health"})
+
+# Health and status bodies are rebuilt at most every PAYLOAD_TTL seconds;
+# liveness probes and scrapes in between get the cached bytes
+PAYLOAD_TTL = 0.5
+_payload_cache: Dict[str, Tuple[float, bytes]] = {}
+_iso_cache: Tuple[int, str] = (0, "")
+
+# /metrics is rendered by a background thread every
+# METRICS_REFRESH_INTERVAL seconds (see config); scrapes return the
+# latest rendering
+_metrics_cache: Dict[str, Any] = {"body": b"", "pid": None}
+_metrics_lock = threading.Lock()
+_METRICS_HEADERS = {"Content-Type": CONTENT_TYPE_LATEST}
+
+
+def _should_log_request() -> bool:
+    """Skip request logs for probe/scrape paths unless LOG_SCRAPES is set"""
+    return request.path not in QUIET_PATHS or app.config.get(
+        "LOG_SCRAPES", False)
 
 
 @app.before_request
 def before_request():
     """Log request details and start timing"""
-    request.start_time = time.time()
+    request.start_time = time.monotonic()
+    if not _should_log_request():
+        return
     logger.info(
         "Request started",
         method=request.method,
@@ -120,55 +257,135 @@ def before_request():
 @app.after_request
 def after_request(response):
     """Log response details and record metrics"""
+    global _request_count, _request_time_sum
     # Calculate request duration
-    duration = time.time() - request.start_time
-    request_times.append(duration)
-
-    # Keep only last 1000 requests for metrics
-    if len(request_times) > 1000:
-        request_times.pop(0)
+    duration = time.monotonic() - request.start_time
 
     # Record metrics
-    REQUEST_COUNT.labels(
-        method=request.method, endpoint=request.path, status=response.status_code
-    ).inc()
-    REQUEST_LATENCY.observe(duration)
+    # Label by routing rule so /items/1 and /items/2 share one series
+    endpoint = (request.url_rule.rule if request.url_rule
+                else UNMATCHED_ENDPOINT)
+    key = (request.method, endpoint, response.status_code)
+    counter = _COUNTER_CACHE.get(key)
+    if counter is None:
+        counter = _COUNTER_CACHE[key] = REQUEST_COUNT.labels(
+            method=key[0], endpoint=key[1], status=key[2])
+    counter.inc()
+    histogram = _LATENCY_CACHE.get(endpoint)
+    if histogram is None:
+        histogram = _LATENCY_CACHE[endpoint] = REQUEST_LATENCY.labels(
+            endpoint=endpoint)
+    histogram.observe(duration)
+    with _totals_lock:
+        _request_count += 1
+        _request_time_sum += duration
 
     # Log response details
-    logger.info(
-        "Request completed",
-        method=request.method,
-        path=request.path,
-        status=response.status_code,
-        duration=duration,
-    )
+    if _should_log_request():
+        logger.info(
+            "Request completed",
+            method=request.method,
+            path=request.path,
+            status=response.status_code,
+            duration=duration,
+        )
+
+    # One write() for everything this request logged
+    _log_buffer.flush()
 
     return response
 
 
-@app.route("/")
-def index():
-    """Main application page"""
-    return render_template("index.html")
+def _json(data: Dict[str, Any], status: int = 200) -> Response:
+    """Serialize *data* with orjson, bypassing jsonify"""
+    return Response(orjson.dumps(data), status=status,
+                    mimetype="application/json")
+
+
+def _cached_json(key: str, build: Callable[..., Dict[str, Any]],
+                 *args: Any) -> Response:
+    """Return build(*args) as JSON, reusing the body for PAYLOAD_TTL"""
+    now = time.monotonic()
+    cached = _payload_cache.get(key)
+    if cached is None or now - cached[0] > PAYLOAD_TTL:
+        cached = (now, orjson.dumps(build(*args)))
+        _payload_cache[key] = cached
+    return Response(cached[1], mimetype="application/json")
+
+
+def _refresh_metrics() -> None:
+    """Re-render the Prometheus exposition text in the background"""
+    while True:
+        time.sleep(app.config["METRICS_REFRESH_INTERVAL"])
+        # A failed render must not kill the thread, or /metrics would
+        # serve the last good body forever
+        try:
+            _metrics_cache["body"] = generate_latest()
+        except Exception:
+            logger.exception("Metrics refresh failed")
+
+
+def _latest_metrics() -> bytes:
+    """Return the cached exposition text, starting the refresher if needed"""
+    # Keyed on pid: threads do not survive a fork, so each worker process
+    # renders once and starts its own refresher
+    if _metrics_cache["pid"] != os.getpid():
+        with _metrics_lock:
+            if _metrics_cache["pid"] != os.getpid():
+                _metrics_cache["body"] = generate_latest()
+                threading.Thread(
+                    target=_refresh_metrics, name="metrics-refresh",
+                    daemon=True).start()
+                _metrics_cache["pid"] = os.getpid()
+    return _metrics_cache["body"]
+
+
+def _utc_timestamp() -> str:
+    """Current UTC time in ISO format, formatted at most once per second"""
+    global _iso_cache
+    sec = int(time.time())
+    if _iso_cache[0] != sec:
+        _iso_cache = (sec, datetime.utcfromtimestamp(sec).isoformat())
+    return _iso_cache[1]
+
+
+def _health_data(status: str) -> Dict[str, Any]:
+    """Build the health payload shared by /health and /api/v1/status"""
+    return {
+        "status": status,
+        "timestamp": _utc_timestamp(),
+        "version": "1.0.0",
+        "uptime": time.time() - start_time,
+    }
+
+
+# Static application information served by /api/v1/info
+_INFO_PAYLOAD = {
+    "name": "DevOps Demo Application",
+    "description": "A demonstration of DevOps best practices",
+    "version": "1.0.0",
+    "environment": app.config.get("ENV", "development"),
+    "features": [
+        "Health monitoring",
+        "Metrics collection",
+        "Structured logging",
+        "API documentation",
+        "Caching",
+        "Security headers",
+    ],
+}
 
 
 @app.route("/health")
 def health():
     """Health check endpoint"""
-    uptime = time.time() - start_time
-    health_data = {
-        "status": "healthy",
-        "timestamp": datetime.utcnow().isoformat(),
-        "version": "1.0.0",
-        "uptime": uptime,
-    }
-    return jsonify(health_data)
+    return _cached_json("health", _health_data, "healthy")
 
 
 @app.route("/metrics")
 def metrics():
     """Prometheus metrics endpoint"""
-    return generate_latest(), 200, {"Content-Type": CONTENT_TYPE_LATEST}
+    return _latest_metrics(), 200, _METRICS_HEADERS
 
 
 @api.route("/api/v1/status")
@@ -176,16 +393,10 @@ class StatusAPI(Resource):
     """API endpoint for application status"""
 
     @api.doc("get_status")
-    @api.marshal_with(health_model)
+    @api.response(200, "Success", health_model)
     def get(self):
         """Get application status"""
-        uptime = time.time() - start_time
-        return {
-            "status": "operational",
-            "timestamp": datetime.utcnow(),
-            "version": "1.0.0",
-            "uptime": uptime,
-        }
+        return _cached_json("status", _health_data, "operational")
 
 
 @api.route("/api/v1/metrics")
@@ -193,53 +404,40 @@ class MetricsAPI(Resource):
     """API endpoint for application metrics"""
 
     @api.doc("get_metrics")
-    @api.marshal_with(metrics_model)
+    @api.response(200, "Success", metrics_model)
     def get(self):
         """Get application metrics"""
-        if request_times:
-            avg_response_time = sum(request_times) / len(request_times)
-            requests_per_second = len(
-                request_times) / (time.time() - start_time)
+        with _totals_lock:
+            count, total = _request_count, _request_time_sum
+
+        if count:
+            avg_response_time = total / count
+            requests_per_second = count / (time.time() - start_time)
         else:
-            avg_response_time = 0
-            requests_per_second = 0
+            avg_response_time = 0.0
+            requests_per_second = 0.0
 
-        return {
-            "requests_total": len(request_times),
-            "requests_per_second": requests_per_second,
-            "average_response_time": avg_response_time,
-        }
+        return _json(
+            {
+                "requests_total": count,
+                "requests_per_second": requests_per_second,
+                "average_response_time": avg_response_time,
+            }
+        )
 
 
-@cache.cached(timeout=300)
 @app.route("/api/v1/info")
+@cache.cached(timeout=300, key_prefix="api_info")
 def info():
     """Cached application information"""
-    return jsonify(
-        {
-            "name": "DevOps Demo Application",
-            "description": "A demonstration of DevOps best practices",
-            "version": "1.0.0",
-            "environment": app.config.get("ENV", "development"),
-            "features": [
-                "Health monitoring",
-                "Metrics collection",
-                "Structured logging",
-                "API documentation",
-                "Caching",
-                "Security headers",
-            ],
-        }
-    )
+    return _json(_INFO_PAYLOAD)
 
 
 @app.errorhandler(404)
 def not_found(error):
     """Handle 404 errors"""
-    return (
-        jsonify(
-            {"error": "Not found", "message": "The requested resource was not found"}
-        ),
+    return _json(
+        {"error": "Not found", "message": "The requested resource was not found"},
         404,
     )
 
@@ -248,20 +446,19 @@ def not_found(error):
 def internal_error(error):
     """Handle 500 errors"""
     logger.error("Internal server error", error=str(error))
-    return (
-        jsonify(
-            {
-                "error": "Internal server error",
-                "message": "An unexpected error occurred",
-            }
-        ),
+    return _json(
+        {
+            "error": "Internal server error",
+            "message": "An unexpected error occurred",
+        },
         500,
     )
 
 
 if __name__ == "__main__":
-    # Configure logging
-    logging.basicConfig(level=logging.INFO)
+    # Configure stdlib loggers (werkzeug etc.) at the same threshold as
+    # structlog; structlog itself writes to the log buffer above
+    logging.basicConfig(level=_log_level())
 
     # Security: Never run in debug mode in production
     debug_mode = app.config.get("DEBUG", False)
@@ -7,6 +7,22 @@ import os
 from typing import Optional, Type
 
 
+def _env_bool(name: str, default: bool) -> bool:
+    """Read a 'true'/'false' environment variable"""
+    value = os.environ.get(name)
+    if value is None:
+        return default
+    return value.lower() == 'true'
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read an integer environment variable, falling back on bad values"""
+    try:
+        return int(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
 class Config:
     """Base configuration class"""
 
@@ -23,22 +39,25 @@ class Config:
 
     # Cache configuration
     CACHE_TYPE = os.environ.get('CACHE_TYPE') or 'simple'
-    CACHE_DEFAULT_TIMEOUT = int(os.environ.get('CACHE_TTL', 300))
+    CACHE_DEFAULT_TIMEOUT = _env_int('CACHE_TTL', 300)
 
     # Logging configuration
     LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
     LOG_FORMAT = os.environ.get('LOG_FORMAT', 'text')
+    # Log /health and /metrics requests too (noisy; for debugging only)
+    LOG_SCRAPES = _env_bool('LOG_SCRAPES', False)
+    # Seconds between background /metrics renderings; keep it below the
+    # Prometheus scrape interval (15s/30s in k8s/monitoring)
+    METRICS_REFRESH_INTERVAL = _env_int('METRICS_REFRESH_INTERVAL', 10)
 
     # Security configuration
-    SECURITY_HEADERS_ENABLED = os.environ.get(
-        'SECURITY_HEADERS_ENABLED', 'true').lower() == 'true'
+    SECURITY_HEADERS_ENABLED = _env_bool('SECURITY_HEADERS_ENABLED', True)
     CORS_ORIGINS = os.environ.get('CORS_ORIGINS', '*').split(',')
-    API_RATE_LIMIT = int(os.environ.get('API_RATE_LIMIT', 100))
+    API_RATE_LIMIT = _env_int('API_RATE_LIMIT', 100)
 
     # Monitoring configuration
-    METRICS_ENABLED = os.environ.get(
-        'METRICS_ENABLED', 'true').lower() == 'true'
-    HEALTH_CHECK_INTERVAL = int(os.environ.get('HEALTH_CHECK_INTERVAL', 30))
+    METRICS_ENABLED = _env_bool('METRICS_ENABLED', True)
+    HEALTH_CHECK_INTERVAL = _env_int('HEALTH_CHECK_INTERVAL', 30)
 
     # Application configuration
     APP_NAME = "DevOps Demo Application"
@@ -46,14 +65,13 @@ class Config:
     APP_DESCRIPTION = "A demonstration of DevOps best practices"
 
     # Session configuration
-    SESSION_TIMEOUT = int(os.environ.get('SESSION_TIMEOUT', 3600))
+    SESSION_TIMEOUT = _env_int('SESSION_TIMEOUT', 3600)
 
     # File upload configuration
     MAX_UPLOAD_SIZE = os.environ.get('MAX_UPLOAD_SIZE', '10MB')
 
     # Compression configuration
-    COMPRESSION_ENABLED = os.environ.get(
-        'COMPRESSION_ENABLED', 'true').lower() == 'true'
+    COMPRESSION_ENABLED = _env_bool('COMPRESSION_ENABLED', True)
 
 
 class DevelopmentConfig(Config):
@@ -110,8 +128,7 @@ class ProductionConfig(Config):
             self.LOG_LEVEL = os.environ.get('LOG_LEVEL')
         if os.environ.get('CACHE_TYPE'):
             self.CACHE_TYPE = os.environ.get('CACHE_TYPE')
-        if os.environ.get('API_RATE_LIMIT'):
-            self.API_RATE_LIMIT = int(os.environ.get('API_RATE_LIMIT'))
+        self.API_RATE_LIMIT = _env_int('API_RATE_LIMIT', self.API_RATE_LIMIT)
 
 
 class StagingConfig(Config):
@@ -10,7 +10,7 @@ from unittest.mock import patch
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 
-@pytest.fixture(autouse=True)
+@pytest.fixture(autouse=True, scope="session")
 def setup_test_environment():
     """Setup test environment variables"""
     test_env = {
@@ -24,6 +24,35 @@ def setup_test_environment():
         yield
 
 
+@pytest.fixture(scope="session")
+def configured_app():
+    """Configure the Flask app once and release its resources at the end"""
+    from src.app import _log_buffer, app, cache
+
+    app.config.update(TESTING=True, WTF_CSRF_ENABLED=False)
+    yield app
+
+    with app.app_context():
+        cache.clear()
+    _log_buffer.flush()
+
+
+@pytest.fixture(scope="session")
+def client(configured_app):
+    """Create a test client shared by the whole session"""
+    with configured_app.test_client() as client:
+        yield client
+
+
+@pytest.fixture
+def restore_app_config(configured_app):
+    """Snapshot app.config for tests that mutate it"""
+    saved = dict(configured_app.config)
+    yield configured_app.config
+    configured_app.config.clear()
+    configured_app.config.update(saved)
+
+
 @pytest.fixture
 def sample_database_config():
     """Sample database configuration for testing"""
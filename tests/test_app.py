@@ -2,20 +2,14 @@
 Tests for the main application
 """
 
-import json
+import io
 import pytest
-from unittest.mock import patch
-from src.app import app
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from src.app import (app, cache, start_time, _BufferedBytesLogger,
+                     _utc_timestamp)
 
-
-@pytest.fixture
-def client():
-    """Create a test client for the application"""
-    app.config['TESTING'] = True
-    app.config['WTF_CSRF_ENABLED'] = False
-
-    with app.test_client() as client:
-        yield client
+HEALTH_FIELDS = frozenset({'status', 'timestamp', 'version', 'uptime'})
 
 
 class TestAppConfiguration:
@@ -25,7 +19,7 @@ class TestAppConfiguration:
         """Test that app is properly configured"""
         assert app is not None
         assert hasattr(app, 'config')
-        # Note: TESTING is set in the client fixture, not globally
+        # Note: TESTING is set once by the configured_app fixture
         assert hasattr(app, 'config')
 
     def test_app_has_required_attributes(self):
@@ -38,11 +32,6 @@ class TestAppConfiguration:
 class TestAppImports:
     """Test that app can be imported and initialized"""
 
-    def test_app_import(self):
-        """Test that app can be imported"""
-        from src.app import app
-        assert app is not None
-
     def test_app_config_loading(self):
         """Test that app config can be loaded"""
         # This test verifies that the app can be initialized without errors
@@ -50,16 +39,250 @@ class TestAppImports:
         assert app.config is not None
 
 
+@pytest.fixture(scope='module')
+def route_set():
+    """Registered URL rules, collected once per module"""
+    return frozenset(rule.rule for rule in app.url_map.iter_rules())
+
+
 class TestAppRoutes:
     """Test that app routes are defined"""
 
-    def test_app_has_routes(self):
+    def test_app_has_routes(self, route_set):
         """Test that app has defined routes"""
         # Check that the app has some routes defined
-        routes = [rule.rule for rule in app.url_map.iter_rules()]
-        assert len(routes) > 0
+        assert route_set
 
-    def test_app_has_health_route(self):
+    def test_app_has_health_route(self, route_set):
         """Test that app has health route"""
-        routes = [rule.rule for rule in app.url_map.iter_rules()]
-        assert '/health' in routes or any('/health' in rule for rule in routes)
+        assert '/health' in route_set
+
+
+class TestMetricsEndpoint:
+    """Test Prometheus metrics labelling"""
+
+    @pytest.fixture(autouse=True)
+    def refresher(self, monkeypatch):
+        """Render /metrics afresh per test without a background thread"""
+        thread = MagicMock()
+        # Replace only src.app's view of threading, not threading.Thread
+        monkeypatch.setattr('src.app.threading', SimpleNamespace(Thread=thread))
+        monkeypatch.setattr('src.app._metrics_cache', {'body': b'', 'pid': None})
+        return thread
+
+    def test_metrics_labelled_by_route(self, client):
+        """Test that request counts are labelled by routing rule"""
+        client.get('/health')
+        response = client.get('/metrics')
+
+        assert response.status_code == 200
+        assert b'endpoint="/health"' in response.data
+
+    def test_metrics_unmatched_path_not_labelled(self, client):
+        """Test that unknown paths do not create their own series"""
+        client.get('/no-such-page-12345')
+        response = client.get('/metrics')
+
+        body = response.data
+        assert b'/no-such-page-12345' not in body
+        assert b'endpoint="<unmatched>"' in body
+
+    def test_latency_histogram_buckets(self, client):
+        """Test that latency buckets extend past the 10s default"""
+        client.get('/health')
+        response = client.get('/metrics')
+
+        assert b'le="60.0"' in response.data
+
+    def test_metrics_cached_between_refreshes(self, client, refresher):
+        """Test that scrapes reuse the rendering and start one refresher"""
+        body = client.get('/metrics').data
+        assert b'http_requests_total' in body
+
+        client.get('/health')
+        assert client.get('/metrics').data == body
+        refresher.assert_called_once()
+        refresher.return_value.start.assert_called_once()
+
+
+class TestHealthEndpoint:
+    """Test health and status endpoints"""
+
+    def test_health_endpoint(self, client):
+        """Test health check returns JSON"""
+        response = client.get('/health')
+        assert response.status_code == 200
+        assert response.content_type == 'application/json'
+
+        data = response.get_json()
+        assert data['status'] == 'healthy'
+
+    def test_health_endpoint_structure(self, client):
+        """Test health check payload fields"""
+        response = client.get('/health')
+        data = response.get_json()
+
+        assert HEALTH_FIELDS.issubset(data)
+
+    def test_health_endpoint_uptime_increases(self, client, monkeypatch):
+        """Test uptime advances with the clock (no sleeping)"""
+        monkeypatch.setattr('src.app._payload_cache', {})
+        uptime1 = client.get('/health').get_json()['uptime']
+        # Moving the start back a second is the same as the clock moving
+        # forward, without touching time.time for the whole process
+        monkeypatch.setattr('src.app.start_time', start_time - 1.0)
+        monkeypatch.setattr('src.app._payload_cache', {})
+        uptime2 = client.get('/health').get_json()['uptime']
+
+        assert uptime2 > uptime1
+
+    def test_health_endpoint_cached_within_ttl(self, client, monkeypatch):
+        """Test that back-to-back probes reuse the cached body"""
+        # Start from an empty cache so an entry left by an earlier test
+        # cannot expire between the two requests
+        monkeypatch.setattr('src.app._payload_cache', {})
+        response1 = client.get('/health')
+        response2 = client.get('/health')
+        assert response1.data == response2.data
+
+    def test_utc_timestamp_formatted_once_per_second(self, monkeypatch):
+        """Test the timestamp has one-second resolution and is reused"""
+        now = [1700000000.25]
+        # Replace only src.app's view of the clock, not time.time itself
+        monkeypatch.setattr('src.app.time', SimpleNamespace(time=lambda: now[0]))
+        monkeypatch.setattr('src.app._iso_cache', (0, ''))
+
+        first = _utc_timestamp()
+        now[0] = 1700000000.75
+        second = _utc_timestamp()
+        now[0] = 1700000001.0
+        third = _utc_timestamp()
+
+        assert first == '2023-11-14T22:13:20'
+        assert second is first
+        assert third == '2023-11-14T22:13:21'
+
+    def test_health_requests_not_logged(self, client):
+        """Test that liveness probes skip the request logs"""
+        with patch('src.app.logger') as mock_logger:
+            client.get('/health')
+            client.get('/api/v1/status')
+
+        assert mock_logger.info.call_count == 2
+        for call in mock_logger.info.call_args_list:
+            assert call.kwargs['path'] == '/api/v1/status'
+
+    def test_health_requests_logged_with_log_scrapes(
+            self, client, restore_app_config):
+        """Test that LOG_SCRAPES re-enables probe logging"""
+        restore_app_config['LOG_SCRAPES'] = True
+        with patch('src.app.logger') as mock_logger:
+            client.get('/health')
+
+        assert mock_logger.info.call_count == 2
+
+    def test_status_endpoint(self, client):
+        """Test API status endpoint"""
+        response = client.get('/api/v1/status')
+        assert response.status_code == 200
+
+        data = response.get_json()
+        assert data['status'] == 'operational'
+        assert data['version'] == '1.0.0'
+
+
+class TestAPIEndpoints:
+    """Test REST API endpoints"""
+
+    def test_metrics_api_endpoint(self, client):
+        """Test API metrics endpoint"""
+        client.get('/health')
+        response = client.get('/api/v1/metrics')
+        assert response.status_code == 200
+
+        data = response.get_json()
+        assert data['requests_total'] > 0
+        assert isinstance(data['requests_per_second'], float)
+        assert isinstance(data['average_response_time'], float)
+
+    def test_info_endpoint(self, client):
+        """Test API info endpoint"""
+        response = client.get('/api/v1/info')
+        assert response.status_code == 200
+
+        data = response.get_json()
+        assert data['name'] == 'DevOps Demo Application'
+        assert 'Caching' in data['features']
+
+    def test_swagger_spec(self, client):
+        """Test the (pre-rendered) Swagger spec is served"""
+        response = client.get('/swagger.json')
+        assert response.status_code == 200
+
+        data = response.get_json()
+        assert '/api/v1/status' in data['paths']
+
+
+class TestCaching:
+    """Test response caching"""
+
+    def test_info_endpoint_caching(self, client):
+        """Test that info endpoint responses are cached"""
+        cache.delete('api_info')
+
+        response = client.get('/api/v1/info')
+        assert response.status_code == 200
+        assert cache.has('api_info')
+
+
+class TestMainPages:
+    """Test HTML pages"""
+
+    def test_index_page(self, client):
+        """Test main page is served with an ETag"""
+        response = client.get('/')
+        assert response.status_code == 200
+        assert response.content_type.startswith('text/html')
+        assert response.headers.get('ETag')
+
+    def test_index_page_not_modified(self, client):
+        """Test repeat visits with a matching ETag get a 304"""
+        etag = client.get('/').headers['ETag']
+        response = client.get('/', headers={'If-None-Match': etag})
+        assert response.status_code == 304
+
+
+class TestErrorHandling:
+    """Test JSON error handlers"""
+
+    def test_404_error(self, client):
+        """Test unknown routes return a JSON 404"""
+        response = client.get('/nonexistent-endpoint')
+        assert response.status_code == 404
+
+        # Show the body rather than a decode error if an HTML page comes back
+        data = response.get_json(silent=True)
+        assert data is not None, response.data[:200]
+        assert data['error'] == 'Not found'
+
+
+class TestLogging:
+    """Test the buffered log sink"""
+
+    def test_info_buffered_until_warning(self):
+        """Test info lines wait in the buffer and warnings flush them"""
+        raw = io.BytesIO()
+        log = _BufferedBytesLogger(io.BufferedWriter(raw, buffer_size=4096))
+
+        log.info(b'{"event":"started"}')
+        assert raw.getvalue() == b''
+
+        log.warning(b'{"event":"slow"}')
+        assert raw.getvalue() == b'{"event":"started"}\n{"event":"slow"}\n'
+
+    def test_request_flushes_log_buffer(self, client):
+        """Test each request flushes its log lines once"""
+        with patch('src.app._log_buffer') as mock_buffer:
+            client.get('/api/v1/status')
+
+        mock_buffer.flush.assert_called_once_with()